@@ -0,0 +1,46 @@
+"""
+Tests for the dependency-free parts of tetra3_pipeline (argument parsing and
+worker plumbing); tetra3 itself is imported lazily and not required here.
+"""
+
+import functools
+import pickle
+import unittest
+
+import tetra3_pipeline
+
+
+def _parse_solve(*extra):
+    parser = tetra3_pipeline.build_parser()
+    return parser.parse_args(["solve", "img.jpg", *extra])
+
+
+class ParseExtractDictTests(unittest.TestCase):
+
+    def test_defaults_give_none(self):
+        self.assertIsNone(tetra3_pipeline.parse_extract_dict(_parse_solve()))
+
+    def test_non_default_args_give_dict(self):
+        ed = tetra3_pipeline.parse_extract_dict(_parse_solve("--min-sum", "600"))
+        self.assertEqual(ed["min_sum"], 600)
+        self.assertEqual(ed["max_axis_ratio"], 1.5)
+        self.assertEqual(ed["min_distance"], 4)
+
+    def test_solve_partial_is_picklable_with_extract_dict(self):
+        # Regression: the partial handed to ProcessPoolExecutor.map must
+        # pickle; a frozen mappingproxy here crashed every multi-worker run
+        # with non-default extraction args.
+        ed = tetra3_pipeline.parse_extract_dict(_parse_solve("--min-sum", "600"))
+        solve = functools.partial(
+            tetra3_pipeline._solve_one,
+            fov_estimate=35.0,
+            fov_max_error=1.5,
+            extract_dict=ed,
+            cache_dir=None
+        )
+        restored = pickle.loads(pickle.dumps(solve))
+        self.assertEqual(restored.keywords["extract_dict"], ed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,21 +11,78 @@ Features:
 """
 
 import argparse
-import csv
+import functools
+import hashlib
+import heapq
+import io
+import json
 import os
+import queue
+import shutil
+import socket
 import sys
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import contextmanager
-from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
-try:
-    import tetra3
-except Exception as e:
-    print("ERROR: Could not import 'tetra3'. Install it from source (GitHub) first.\n"
-          "Repo: https://github.com/esa/tetra3\n"
-          f"Details: {e}")
-    sys.exit(1)
+# Start of the process, for elapsed-time log prefixes: perf_counter is far
+# cheaper than wall-clock formatting with its timezone lookup, and a
+# monotonic offset reads better when timing the pipeline anyway.
+_T0 = time.perf_counter()
+
+
+def _elapsed() -> str:
+    return f"{time.perf_counter() - _T0:8.3f}s"
+
+
+# Heavy imports (tetra3 pulls NumPy, SciPy and PIL) are deferred so that
+# --help, shell completion and argument errors don't pay the ~1 s import
+# cost. _import_tetra3 populates these module globals and is called at the
+# top of each subcommand (and in pool workers via _worker_init).
+tetra3: Any = None
+np: Any = None
+Image: Any = None
+xxhash: Any = None     # optional, faster content hashing for the centroid cache
+TurboJPEG: Any = None  # optional, SIMD JPEG decode
+TJPF_GRAY: Any = None
+pyvips: Any = None     # optional, fast decode for non-JPEG formats
+
+
+def _import_tetra3() -> None:
+    global tetra3, np, Image, xxhash, TurboJPEG, TJPF_GRAY, pyvips
+    if tetra3 is not None:
+        return
+    try:
+        import tetra3 as _tetra3  # type: ignore[import-not-found]
+        import numpy
+        from PIL import Image as _Image
+    except Exception as e:
+        print("ERROR: Could not import 'tetra3'. Install it from source (GitHub) first.\n"
+              "Repo: https://github.com/esa/tetra3\n"
+              f"Details: {e}")
+        sys.exit(1)
+    tetra3, np, Image = _tetra3, numpy, _Image
+
+    try:
+        import xxhash as _xxhash  # type: ignore[import-not-found]
+        xxhash = _xxhash
+    except ImportError:
+        pass
+    try:
+        from turbojpeg import TurboJPEG as _TurboJPEG, TJPF_GRAY as _TJPF_GRAY  # type: ignore[import-not-found]
+        TurboJPEG, TJPF_GRAY = _TurboJPEG, _TJPF_GRAY
+    except Exception:
+        pass
+    try:
+        import pyvips as _pyvips  # type: ignore[import-not-found]
+        pyvips = _pyvips
+    except Exception:
+        pass
 
 
 @contextmanager
@@ -75,28 +132,74 @@ def ensure_catalog_available(star_catalog: str, catalog_dir: Optional[Path]) ->
     sys.exit(3)
 
 
+def _pre_filter_hip(dat_path: Path, mag_limit: float) -> Path:
+    """
+    Pre-filter the HIPPARCOS main catalog by magnitude before tetra3 parses
+    it. Vmag is the 6th pipe-delimited field; rows above the limit (or with
+    an unparseable magnitude) are dropped with a NumPy mask, so tetra3's
+    row-by-row parse and the O(n^2) pattern construction only ever see the
+    surviving stars. Returns a temp directory holding the trimmed file under
+    the expected 'hip_main.dat' name.
+    """
+    raw = dat_path.read_bytes().splitlines(keepends=True)
+    mags = np.full(len(raw), np.inf)
+    for i, line in enumerate(raw):
+        fields = line.split(b"|")
+        if len(fields) > 5:
+            try:
+                mags[i] = float(fields[5])
+            except ValueError:
+                pass
+    keep = mags <= mag_limit
+
+    trim_dir = Path(tempfile.mkdtemp(prefix="tetra3_hip_trim_"))
+    with open(trim_dir / dat_path.name, "wb") as out:
+        out.writelines(line for line, kept in zip(raw, keep) if kept)
+    print(f"  pre-filter       : kept {int(keep.sum())}/{len(raw)} HIP rows (mag <= {mag_limit})")
+    return trim_dir
+
+
 def cmd_generate_db(args: argparse.Namespace) -> None:
     """
     Generate a Tetra3 database tailored to your FOV and magnitude limit.
     """
+    _import_tetra3()
+
     out_path = Path(args.output).expanduser().resolve()
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
     catalog_dir = Path(args.catalog_dir).expanduser().resolve() if args.catalog_dir else None
     ensure_catalog_available(args.star_catalog, catalog_dir)
 
-    print(f"[{datetime.now().isoformat(timespec='seconds')}] Generating database...")
+    if args.target_fov is not None:
+        # Fixed-lens use case: specialize the DB to a single FOV so pattern
+        # bins are tighter and each solve probes fewer hash entries.
+        args.min_fov = args.max_fov = float(args.target_fov)
+
+    print(f"[{_elapsed()}] Generating database...")
     print(f"  star_catalog     : {args.star_catalog}")
     print(f"  catalog_dir      : {catalog_dir if catalog_dir else '(current dir)'}")
     print(f"  FOV range (deg)  : {args.min_fov} -> {args.max_fov}")
     print(f"  mag limit        : {args.star_max_magnitude}")
+    print(f"  stars per FOV    : {args.pattern_stars_per_fov}")
     print(f"  output db        : {out_path}")
 
-    if catalog_dir:
-        with pushd(catalog_dir):
+    work_dir = catalog_dir
+    trim_dir = None
+    if args.star_catalog == "hip_main" and float(args.star_max_magnitude) < 9.0:
+        src_dir = catalog_dir if catalog_dir and (catalog_dir / "hip_main.dat").exists() else Path.cwd()
+        trim_dir = _pre_filter_hip(src_dir / "hip_main.dat", float(args.star_max_magnitude))
+        work_dir = trim_dir
+
+    try:
+        if work_dir:
+            with pushd(work_dir):
+                _generate_db_core(args, out_path)
+        else:
             _generate_db_core(args, out_path)
-    else:
-        _generate_db_core(args, out_path)
+    finally:
+        if trim_dir:
+            shutil.rmtree(trim_dir, ignore_errors=True)
 
     print(f"[OK] Database created: {out_path}")
 
@@ -108,11 +211,321 @@ def _generate_db_core(args: argparse.Namespace, out_path: Path) -> None:
         max_fov=float(args.max_fov),
         star_catalog=args.star_catalog,
         star_max_magnitude=float(args.star_max_magnitude),
+        pattern_stars_per_fov=int(args.pattern_stars_per_fov),
         save_as=str(out_path)
     )
 
 
-def parse_extract_dict(args: argparse.Namespace) -> Dict[str, Any]:
+# Extensions (without dot) accepted when expanding an image directory.
+_IMAGE_EXTENSIONS = frozenset({"jpg", "jpeg", "png", "tif", "tiff", "bmp", "fits"})
+
+# Per-process Tetra3 instance; populated by _worker_init so each worker in the
+# solve pool loads the database exactly once instead of once per image.
+_worker_t3: Any = None
+
+
+def _shards_current(shard_dir: Path, db_path: Path) -> bool:
+    stamp = shard_dir / ".stamp"
+    return stamp.exists() and stamp.stat().st_mtime >= db_path.stat().st_mtime
+
+
+def _unpack_database(db_path: Path) -> Path:
+    """
+    Unpack the database .npz into a sibling directory of .npy shards (members
+    of a zip archive cannot be memory-mapped in place). Re-unpacks only when
+    the .npz is newer than the shards. The extraction goes into a temp
+    directory that is renamed into place, so concurrent callers (e.g. pool
+    workers initializing together) only ever see a fully formed shard
+    directory and never mmap a half-written file.
+    """
+    shard_dir = db_path.with_suffix(".mmap")
+    if _shards_current(shard_dir, db_path):
+        return shard_dir
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix=shard_dir.name + ".",
+                                    dir=str(shard_dir.parent)))
+    try:
+        with zipfile.ZipFile(db_path) as zf:
+            zf.extractall(tmp_dir)
+        (tmp_dir / ".stamp").touch()
+        try:
+            os.rename(tmp_dir, shard_dir)
+        except OSError:
+            # shard_dir already exists: either a concurrent unpacker beat us
+            # (its shards are as good as ours) or the shards are stale and
+            # must be swapped out.
+            if not _shards_current(shard_dir, db_path):
+                shutil.rmtree(shard_dir, ignore_errors=True)
+                os.rename(tmp_dir, shard_dir)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return shard_dir
+
+
+class _MmapNpz:
+    """
+    Minimal stand-in for the object np.load returns for an .npz archive,
+    backed by memory-mapped .npy shards so the pattern catalog and star table
+    are demand-paged by the kernel instead of read into RAM up front.
+    """
+
+    def __init__(self, shard_dir: Path):
+        self._dir = shard_dir
+        self.files = [p.stem for p in shard_dir.glob("*.npy")]
+
+    def __getitem__(self, key: str):
+        return np.load(str(self._dir / (key + ".npy")), mmap_mode="r")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.files
+
+    def keys(self):
+        return self.files
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "_MmapNpz":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+def _load_database_mmap(db_path: str):
+    """
+    Load a Tetra3 database with its arrays memory-mapped. tetra3 reads the
+    .npz via np.load, so temporarily intercept that call and hand it mmapped
+    shards instead; everything else in tetra3's loader runs unchanged.
+    """
+    shard_dir = _unpack_database(Path(db_path))
+    db_stem = Path(db_path).stem
+    real_load = np.load
+
+    def patched_load(file, *args, **kwargs):
+        if Path(str(file)).stem == db_stem:
+            return _MmapNpz(shard_dir)
+        return real_load(file, *args, **kwargs)
+
+    np.load = patched_load
+    try:
+        return tetra3.Tetra3(load_database=db_path)
+    finally:
+        np.load = real_load
+
+
+def _worker_init(db_path: str) -> None:
+    global _worker_t3
+    _import_tetra3()
+    try:
+        _worker_t3 = _load_database_mmap(db_path)
+    except Exception as e:
+        print(f"  (mmap database load failed: {e}; loading normally)")
+        _worker_t3 = tetra3.Tetra3(load_database=db_path)
+
+
+# Process-local TurboJPEG handle; constructing one per image is wasteful.
+_turbojpeg = None
+
+
+def _decode_grayscale(img: str):
+    """
+    Decode an image to a grayscale ndarray using the fastest decoder
+    available: libjpeg-turbo for JPEGs, pyvips for other formats, falling
+    back to PIL when the fast decoders are missing or cannot handle the
+    file (local libvips builds often lack e.g. FITS support). tetra3's
+    centroid extraction accepts the ndarray directly.
+    """
+    global _turbojpeg
+    suffix = img.rpartition(".")[2].lower()
+    if TurboJPEG is not None and suffix in ("jpg", "jpeg"):
+        try:
+            if _turbojpeg is None:
+                _turbojpeg = TurboJPEG()
+            with open(img, "rb") as f:
+                arr = _turbojpeg.decode(f.read(), pixel_format=TJPF_GRAY)
+            return arr[:, :, 0] if arr.ndim == 3 else arr
+        except Exception:
+            pass
+    if pyvips is not None:
+        try:
+            vimg = pyvips.Image.new_from_file(img, access="sequential")
+            if vimg.bands > 1:
+                vimg = vimg.colourspace("b-w")
+            arr = vimg.numpy()
+            return arr[:, :, 0] if arr.ndim == 3 else arr
+        except Exception:
+            pass
+    with Image.open(img) as pil_img:
+        # No convert("L") here: it clips 16-bit TIFF/PNG (common astro
+        # formats) to uint8. Take the raw array at full depth and average
+        # the channels for color images, mirroring tetra3's own conversion.
+        arr = np.asarray(pil_img)
+        return arr.mean(axis=2) if arr.ndim == 3 else arr
+
+
+def _centroid_cache_key(img: str, extract_dict: Optional[Dict[str, Any]]) -> str:
+    """
+    Cache key for one image's centroids: content hash of the image bytes plus
+    the extraction parameters (different params give different centroids).
+    """
+    with open(img, "rb") as f:
+        data = f.read()
+    if xxhash is not None:
+        digest = xxhash.xxh3_64(data).hexdigest()
+    else:
+        digest = hashlib.blake2b(data, digest_size=8).hexdigest()
+    ed = extract_dict or {}
+    return "_".join([digest] + [f"{k}={ed[k]}" for k in sorted(ed)])
+
+
+def _get_centroids(img: str, extract_dict: Optional[Dict[str, Any]],
+                   cache_dir: Optional[Path]) -> Tuple[Any, Tuple[int, int]]:
+    """
+    Extract centroids from an image, consulting the on-disk cache first when
+    one is configured. On a hit the expensive decode+extraction is skipped
+    entirely; on a miss the result (and the image size, so the image need not
+    be reopened later) is saved for subsequent runs.
+    """
+    entry = None
+    if cache_dir is not None:
+        entry = cache_dir / (_centroid_cache_key(img, extract_dict) + ".npz")
+        if entry.exists():
+            try:
+                with np.load(str(entry)) as data:
+                    return data["centroids"], (int(data["image_size"][0]), int(data["image_size"][1]))
+            except Exception:
+                # Truncated/corrupt entry (e.g. from an interrupted run):
+                # re-extract and overwrite it rather than failing forever.
+                pass
+
+    image = _decode_grayscale(img)
+    image_size = (int(image.shape[0]), int(image.shape[1]))
+    centroids = tetra3.get_centroids_from_image(image, **(extract_dict or {}))
+
+    if entry is not None:
+        # Write via a temp file and rename so an interrupted run never
+        # leaves a half-written entry, same as the database shard unpack.
+        fd, tmp = tempfile.mkstemp(dir=str(cache_dir), suffix=".npz.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, centroids=centroids, image_size=np.asarray(image_size))
+            os.replace(tmp, entry)
+        except Exception:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+    return centroids, image_size
+
+
+def _solve_one(img: str, fov_estimate: float, fov_max_error: float,
+               extract_dict: Optional[Dict[str, Any]],
+               cache_dir: Optional[Path] = None
+               ) -> Tuple[str, bool, Any, Any, Any, Any, Optional[str]]:
+    """
+    Solve a single image with the process-local Tetra3 instance.
+    Returns (image, success, ra, dec, rot, fov, error) so results can be
+    printed/logged uniformly by the parent process.
+    """
+    try:
+        centroids, image_size = _get_centroids(img, extract_dict, cache_dir)
+    except Exception as e:
+        return (img, False, "", "", "", "", str(e))
+    return _solve_centroids_row(img, centroids, image_size,
+                                fov_estimate, fov_max_error)
+
+
+def _prefetch(paths: List[str]) -> None:
+    """
+    Ask the kernel to start pulling these files into the page cache
+    (POSIX_FADV_WILLNEED), overlapping disk latency with the current batch's
+    compute. No-op where posix_fadvise is unavailable; unreadable files are
+    skipped and will error properly when actually decoded.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for p in paths:
+        try:
+            fd = os.open(p, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+
+
+def _batch_solve(images: List[str], extract_dict: Optional[Dict[str, Any]],
+                 cache_dir: Optional[Path], fov_estimate: float,
+                 fov_max_error: float, batch_size: int = 32):
+    """
+    Generator over result rows: extract centroids for a batch of images on a
+    thread pool (decode and extraction release the GIL), then run the matcher
+    back-to-back over the batch so its hot path stays cache-resident. Solving
+    overlaps with extraction of later images in the same batch.
+    """
+
+    def extract_one(img: str):
+        try:
+            centroids, image_size = _get_centroids(img, extract_dict, cache_dir)
+            return (img, centroids, image_size, None)
+        except Exception as e:
+            return (img, None, None, str(e))
+
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as pool:
+        for start in range(0, len(images), batch_size):
+            batch = images[start:start + batch_size]
+            # Warm the page cache for the next batch while this one computes.
+            _prefetch(images[start + batch_size:start + 2 * batch_size])
+            for img, centroids, image_size, error in pool.map(extract_one, batch):
+                if error is not None:
+                    yield (img, False, "", "", "", "", error)
+                else:
+                    yield _solve_centroids_row(img, centroids, image_size,
+                                               fov_estimate, fov_max_error)
+
+
+def _solve_centroids_row(img: str, centroids: Any, image_size: Tuple[int, int],
+                         fov_estimate: float, fov_max_error: float
+                         ) -> Tuple[str, bool, Any, Any, Any, Any, Optional[str]]:
+    """Solve pre-extracted centroids with the process-local Tetra3 instance."""
+    try:
+        res = _worker_t3.solve_from_centroids(
+            centroids,
+            image_size,
+            fov_estimate=fov_estimate,
+            fov_max_error=fov_max_error
+        )
+    except Exception as e:
+        return (img, False, "", "", "", "", str(e))
+
+    success = bool(res.get("success", False))
+    ra = res.get("ra_deg", "")
+    dec = res.get("dec_deg", "")
+    rot = res.get("rotation_deg", "")
+    fov = res.get("fov_deg", "")
+    return (img, success, ra, dec, rot, fov, None)
+
+
+# Defaults for the centroid-extraction parameters, shared between the CLI
+# definitions and parse_extract_dict's fast-path check.
+_DEFAULT_MIN_SUM = 500
+_DEFAULT_MAX_AXIS_RATIO = 1.5
+_DEFAULT_MIN_DISTANCE = 4
+
+
+def parse_extract_dict(args: argparse.Namespace) -> Optional[Dict[str, Any]]:
+    """
+    Build the extract_dict handed to tetra3, or None when every parameter
+    still equals its CLI default so tetra3 takes its own default path without
+    a per-image dict to re-read. A plain dict: nothing mutates it, and it has
+    to survive pickling into the worker processes.
+    """
+    if (args.min_sum == _DEFAULT_MIN_SUM
+            and args.max_axis_ratio == _DEFAULT_MAX_AXIS_RATIO
+            and args.min_distance == _DEFAULT_MIN_DISTANCE):
+        return None
     ed: Dict[str, Any] = {}
     if args.min_sum is not None:
         ed["min_sum"] = int(args.min_sum)
@@ -123,77 +536,301 @@ def parse_extract_dict(args: argparse.Namespace) -> Dict[str, Any]:
     return ed
 
 
-def cmd_solve(args: argparse.Namespace) -> None:
+def _row_to_json(row: Tuple[str, bool, Any, Any, Any, Any, Optional[str]]) -> str:
+    """Serialize a result row for the solver daemon (NumPy scalars included)."""
+    img, success, ra, dec, rot, fov, error = row
+
+    def num(value: Any) -> Optional[float]:
+        value = _as_float(value)
+        return None if value != value else value
+
+    return json.dumps({"image": img, "success": bool(success),
+                       "ra_deg": num(ra), "dec_deg": num(dec),
+                       "rotation_deg": num(rot), "fov_deg": num(fov),
+                       "error": error})
+
+
+def _json_to_row(payload: Dict[str, Any]) -> Tuple[str, bool, Any, Any, Any, Any, Optional[str]]:
+    def field(key: str) -> Any:
+        value = payload.get(key)
+        return "" if value is None else value
+
+    return (payload.get("image", ""), bool(payload.get("success", False)),
+            field("ra_deg"), field("dec_deg"), field("rotation_deg"),
+            field("fov_deg"), payload.get("error"))
+
+
+def cmd_serve(args: argparse.Namespace) -> None:
+    """
+    Long-running solver daemon: load the database once, then solve image
+    paths received as JSON lines on a Unix-domain socket. Amortizes the DB
+    load across many 'solve --server' invocations during iterative tuning.
+    """
+    _import_tetra3()
+
     db_path = Path(args.database).expanduser().resolve()
     if not db_path.exists():
         print(f"ERROR: Database file not found: {db_path}")
         print("Generate it first with the 'generate-db' command.")
         sys.exit(4)
 
-    images: List[Path] = []
+    sock_path = Path(args.socket)
+    if sock_path.exists():
+        sock_path.unlink()
+
+    print(f"[{_elapsed()}] Loading database: {db_path}")
+    _worker_init(str(db_path))
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(sock_path))
+    server.listen(1)
+    print(f"Solver daemon listening on {sock_path} (Ctrl-C to stop)")
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn, conn.makefile("rwb") as stream:
+                for line in stream:
+                    try:
+                        req = json.loads(line)
+                        row = _solve_one(
+                            req["image"],
+                            float(req.get("fov_estimate", 35.0)),
+                            float(req.get("fov_max_error", 1.5)),
+                            req.get("extract_dict") or None
+                        )
+                    except Exception as e:
+                        row = ("", False, "", "", "", "", str(e))
+                    stream.write(_row_to_json(row).encode("utf-8") + b"\n")
+                    stream.flush()
+    finally:
+        server.close()
+        if sock_path.exists():
+            sock_path.unlink()
+
+
+def _db_fov_bounds(db_path: Path) -> Optional[Tuple[float, float]]:
+    """
+    Read the FOV range a database was generated for from its stored
+    properties; returns None if the props cannot be read (old tetra3
+    versions, different layout).
+    """
+    try:
+        with np.load(str(db_path)) as data:
+            props = data["props_packed"][()]
+            return (float(props["min_fov"]), float(props["max_fov"]))
+    except Exception:
+        return None
+
+
+def _csv_writer_worker(rows: "queue.Queue", writer, csv_file, flush_every: int = 64) -> None:
+    """
+    Drain result rows from the queue onto the CSV writer so the solver thread
+    never blocks on file I/O. Flushes every flush_every rows, bounding what an
+    interrupted run can lose; a None sentinel ends the stream.
+    """
+    pending = 0
+    while True:
+        row = rows.get()
+        if row is None:
+            break
+        writer.writerow(row)
+        pending += 1
+        if pending >= flush_every:
+            csv_file.flush()
+            pending = 0
+
+
+def _format_result(row: Tuple[str, bool, Any, Any, Any, Any, Optional[str]]) -> str:
+    img, success, ra, dec, rot, fov, error = row
+    if error is not None:
+        return f"ERROR during solve of {img}: {error}"
+    if success:
+        return f"SUCCESS  {img}  RA={ra}  DEC={dec}  ROT={rot}  FOV={fov}"
+    return f"FAILED   {img}"
+
+
+def _as_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def cmd_solve(args: argparse.Namespace) -> None:
+    _import_tetra3()
+    import csv
+
+    db_path = Path(args.database).expanduser().resolve()
+    if not args.server and not db_path.exists():
+        print(f"ERROR: Database file not found: {db_path}")
+        print("Generate it first with the 'generate-db' command.")
+        sys.exit(4)
+
+    # Expanded paths are kept as plain absolute strings: tetra3 and the CSV
+    # want strings anyway, and for 1e5-image runs the per-image Path objects
+    # are pure allocation overhead.
+    images: List[str] = []
     for p in args.images:
         pth = Path(p).expanduser()
         if pth.is_dir():
-            images.extend(sorted([*pth.glob("*.jpg"), *pth.glob("*.jpeg"),
-                                  *pth.glob("*.png"), *pth.glob("*.tif"), *pth.glob("*.tiff"),
-                                  *pth.glob("*.bmp"), *pth.glob("*.fits")]))
+            # One scandir pass instead of one glob (and one stat per entry)
+            # per extension; matters on large or network-mounted directories.
+            # Entries are bucketed by extension, each bucket sorted, and the
+            # buckets merged lazily: smaller sorts and no second full list.
+            by_ext: Dict[str, List[str]] = {ext: [] for ext in _IMAGE_EXTENSIONS}
+            with os.scandir(pth) as entries:
+                for e in entries:
+                    ext = e.name.rpartition(".")[2].lower()
+                    if ext in by_ext and e.is_file(follow_symlinks=False):
+                        by_ext[ext].append(os.path.abspath(e.path))
+            images.extend(heapq.merge(*(sorted(bucket) for bucket in by_ext.values())))
         else:
-            images.append(pth)
+            images.append(os.path.abspath(str(pth)))
 
     if not images:
         print("ERROR: No images to solve.")
         sys.exit(5)
 
-    print(f"[{datetime.now().isoformat(timespec='seconds')}] Loading database: {db_path}")
-    t3 = tetra3.Tetra3(load_database=str(db_path))
-
     extract_dict = parse_extract_dict(args)
-    print(f"FOV estimate: {args.fov_estimate} deg  |  FOV max error: {args.fov_max_error} deg")
+
+    fov_estimate = float(args.fov_estimate)
+    fov_max_error = float(args.fov_max_error)
+    bounds = _db_fov_bounds(db_path) if not args.server else None
+    if bounds and not (bounds[0] <= fov_estimate <= bounds[1]):
+        midpoint = (bounds[0] + bounds[1]) / 2.0
+        print(f"WARNING: FOV estimate {fov_estimate} deg is outside the database's "
+              f"{bounds[0]}-{bounds[1]} deg range; using {midpoint} deg instead.")
+        fov_estimate = midpoint
+
+    print(f"FOV estimate: {fov_estimate} deg  |  FOV max error: {fov_max_error} deg")
     if extract_dict:
         print(f"extract_dict: {extract_dict}")
 
     csv_path = Path(args.csv).expanduser().resolve() if args.csv else None
+
+    cache_dir = Path(args.centroid_cache).expanduser().resolve() if args.centroid_cache else None
+    if cache_dir:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+    solve = functools.partial(
+        _solve_one,
+        fov_estimate=fov_estimate,
+        fov_max_error=fov_max_error,
+        extract_dict=extract_dict,
+        cache_dir=cache_dir
+    )
+
+    workers = args.workers if args.workers else (os.cpu_count() or 1)
+    workers = min(workers, len(images))
+
+    def iter_rows():
+        if args.server:
+            # Stream paths to an already-warm solver daemon instead of paying
+            # the database load in this process.
+            print(f"Sending {len(images)} image(s) to solver daemon at {args.server}")
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                try:
+                    sock.connect(args.server)
+                except OSError as e:
+                    print(f"ERROR: Could not connect to solver daemon at {args.server}: {e}")
+                    print("Start one first with the 'serve' command, e.g.:")
+                    print(f"  tetra3-pipeline serve --database {args.database} --socket {args.server}")
+                    sys.exit(6)
+                with sock.makefile("rwb") as stream:
+                    for img in images:
+                        request = {"image": img,
+                                   "fov_estimate": fov_estimate,
+                                   "fov_max_error": fov_max_error,
+                                   "extract_dict": extract_dict}
+                        stream.write(json.dumps(request).encode("utf-8") + b"\n")
+                        stream.flush()
+                        reply = stream.readline()
+                        if not reply:
+                            yield (img, False, "", "", "", "", "daemon closed connection")
+                            break
+                        yield _json_to_row(json.loads(reply))
+        elif workers > 1:
+            # Each image solve is independent and CPU-bound, so fan out across
+            # processes; the DB is loaded once per worker by the initializer.
+            # Unpack the mmap shards here in the parent first, so the workers
+            # don't race each other extracting into the same directory.
+            try:
+                _unpack_database(db_path)
+            except Exception as e:
+                print(f"  (database unpack failed: {e}; workers will load normally)")
+            print(f"Solving {len(images)} image(s) with {workers} worker processes...")
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=_worker_init,
+                                     initargs=(str(db_path),)) as executor:
+                yield from executor.map(solve, images, chunksize=4)
+        else:
+            # Single worker: extract centroids for a batch of images on a
+            # thread pool while this thread pattern-matches, so extraction
+            # latency is hidden behind the matcher.
+            print(f"[{_elapsed()}] Loading database: {db_path}")
+            _worker_init(str(db_path))
+            yield from _batch_solve(images, extract_dict, cache_dir,
+                                    fov_estimate, fov_max_error)
+
+    n = len(images)
+    done = 0
+    solved = 0
+
+    # CSV rows go through a queue to a background writer thread, so the
+    # solver never blocks on filesystem latency (NFS, slow SD cards). The
+    # binary file keeps its 1 MiB buffer and the TextIOWrapper keeps csv's
+    # quoting for paths containing commas/quotes.
+    csv_file = None
+    csv_queue: Optional["queue.Queue"] = None
+    csv_thread = None
     if csv_path:
         csv_path.parent.mkdir(parents=True, exist_ok=True)
-        csv_file = open(csv_path, "w", newline="", encoding="utf-8")
+        raw = open(csv_path, "wb", buffering=1 << 20)
+        csv_file = io.TextIOWrapper(raw, newline="", encoding="utf-8")
         writer = csv.writer(csv_file)
         writer.writerow(["image", "success", "ra_deg", "dec_deg", "rotation_deg", "fov_deg"])
-    else:
-        writer = None
-        csv_file = None
-
+        csv_queue = queue.Queue()
+        csv_thread = threading.Thread(target=_csv_writer_worker,
+                                      args=(csv_queue, writer, csv_file),
+                                      daemon=True)
+        csv_thread.start()
+
+    # One updating progress line instead of several prints per image; details
+    # are emitted only for failures or with --verbose (tqdm when installed,
+    # a plain carriage-return line otherwise).
     try:
-        for img in images:
-            print(f"\nSolving: {img}")
-            try:
-                res = t3.solve_from_image(
-                    str(img),
-                    fov_estimate=float(args.fov_estimate),
-                    fov_max_error=float(args.fov_max_error),
-                    extract_dict=extract_dict if extract_dict else None
-                )
-            except Exception as e:
-                print(f"  ERROR during solve: {e}")
-                if writer:
-                    writer.writerow([str(img), False, "", "", "", ""])
-                continue
-
-            success = bool(res.get("success", False))
-            ra = res.get("ra_deg", "")
-            dec = res.get("dec_deg", "")
-            rot = res.get("rotation_deg", "")
-            fov = res.get("fov_deg", "")
-
-            if success:
-                print(f"  SUCCESS  RA={ra}  DEC={dec}  ROT={rot}  FOV={fov}")
-            else:
-                print("  FAILED")
-
-            if writer:
-                writer.writerow([str(img), success, ra, dec, rot, fov])
+        from tqdm import tqdm  # type: ignore[import-untyped]
+    except ImportError:
+        tqdm = None
+    progress = tqdm(total=n, unit="img") if (tqdm and not args.verbose) else None
 
+    try:
+        for row in iter_rows():
+            if args.verbose or not row[1]:
+                line = _format_result(row)
+                if progress is not None:
+                    progress.write("  " + line)
+                elif args.verbose:
+                    print("  " + line)
+                else:
+                    print("\n  " + line)
+            if csv_queue is not None:
+                csv_queue.put([row[0], bool(row[1]), row[2], row[3], row[4], row[5]])
+            done += 1
+            solved += 1 if row[1] else 0
+            if progress is not None:
+                progress.update(1)
+            elif not args.verbose:
+                print(f"\r[{done}/{n}] solved {solved}", end="", flush=True)
     finally:
-        if csv_path:
+        if progress is not None:
+            progress.close()
+        elif not args.verbose and done:
+            print()
+        if csv_queue is not None:
+            assert csv_thread is not None and csv_file is not None
+            csv_queue.put(None)
+            csv_thread.join()
             csv_file.close()
             print(f"\n[OK] Results saved to CSV: {csv_path}")
 
@@ -213,6 +850,10 @@ def build_parser() -> argparse.ArgumentParser:
     g.add_argument("--max-fov", type=float, default=36.0, help="Maximum FOV (deg). Default: 36.")
     g.add_argument("--star-max-magnitude", type=float, default=8.0,
                    help="Magnitude limit for DB generation. Default: 8.0.")
+    g.add_argument("--target-fov", type=float, default=None,
+                   help="Specialize the DB to this single FOV (deg); overrides min/max FOV.")
+    g.add_argument("--pattern-stars-per-fov", type=int, default=15,
+                   help="Pattern stars per FOV passed to tetra3. Default: 15.")
     g.add_argument("-o", "--output", default="db_12p5mm_from_hip.npz",
                    help="Output database filename. Default: db_12p5mm_from_hip.npz")
     g.set_defaults(func=cmd_generate_db)
@@ -224,12 +865,30 @@ def build_parser() -> argparse.ArgumentParser:
                    help="Path to a generated database .npz file.")
     s.add_argument("--fov-estimate", type=float, default=35.0, help="Estimated FOV (deg).")
     s.add_argument("--fov-max-error", type=float, default=1.5, help="Allowed FOV error (deg).")
-    s.add_argument("--min-sum", type=int, default=500, help="extract_dict: min_sum.")
-    s.add_argument("--max-axis-ratio", type=float, default=1.5, help="extract_dict: max_axis_ratio.")
-    s.add_argument("--min-distance", type=int, default=4, help="extract_dict: min_distance.")
+    s.add_argument("--min-sum", type=int, default=_DEFAULT_MIN_SUM,
+                   help="extract_dict: min_sum.")
+    s.add_argument("--max-axis-ratio", type=float, default=_DEFAULT_MAX_AXIS_RATIO,
+                   help="extract_dict: max_axis_ratio.")
+    s.add_argument("--min-distance", type=int, default=_DEFAULT_MIN_DISTANCE,
+                   help="extract_dict: min_distance.")
     s.add_argument("--csv", default=None, help="Optional path to save results as CSV.")
+    s.add_argument("--workers", type=int, default=None,
+                   help="Worker processes for solving. Default: all CPU cores.")
+    s.add_argument("--centroid-cache", default=None,
+                   help="Directory for caching extracted centroids between runs.")
+    s.add_argument("--server", default=None,
+                   help="Unix socket of a running 'serve' daemon to solve through.")
+    s.add_argument("--verbose", "-v", action="store_true",
+                   help="Print a detail line for every image, not just failures.")
     s.set_defaults(func=cmd_solve)
 
+    d = sub.add_parser("serve", help="Run a solver daemon that keeps the database loaded.")
+    d.add_argument("--database", "-d", default="db_12p5mm_from_hip.npz",
+                   help="Path to a generated database .npz file.")
+    d.add_argument("--socket", default="/tmp/tetra3.sock",
+                   help="Unix socket path to listen on. Default: /tmp/tetra3.sock")
+    d.set_defaults(func=cmd_serve)
+
     return p
 
 